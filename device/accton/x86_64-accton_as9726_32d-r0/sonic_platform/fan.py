@@ -6,6 +6,9 @@
 #
 #############################################################################
 
+import os
+import time
+
 try:
     from sonic_platform_base.fan_base import FanBase
     from .helper import APIHelper
@@ -13,39 +16,90 @@ except ImportError as e:
     raise ImportError(str(e) + "- required module not found")
 
 PSU_FAN_MAX_RPM = 26688
+# get_speed/set_speed re-check presence, reuse it within this window (seconds)
+PRESENCE_CACHE_TTL = 0.1
 
 CPLD_I2C_PATH = "/sys/bus/i2c/devices/14-0066/fan_"
 PSU_HWMON_I2C_PATH ="/sys/bus/i2c/devices/{}-00{}/"
-PSU_I2C_MAPPING = {
-    0: {
-        "num": 9,
-        "addr": "58"
-    },
-    1: {
-        "num": 9,
-        "addr": "59"
-    },
-}
+# (i2c bus, i2c address) of each PSU, indexed by psu_index
+PSU_I2C_MAPPING = (
+    (9, "58"),
+    (9, "59"),
+)
+
+# Stateless apart from platform/hwsku, one helper serves every Fan
+_API_HELPER = APIHelper()
 
 
 class Fan(FanBase):
     """Platform-specific Fan class"""
 
+    __slots__ = ('_api_helper', '_fds', 'fan_index', 'fan_tray_index',
+                 'is_psu_fan', 'psu_index', 'psu_i2c_num', 'psu_i2c_addr',
+                 'psu_hwmon_path', '_dir_path', '_speed_path',
+                 '_present_path', '_presence', '_presence_time')
+
     def __init__(self, fan_tray_index, fan_index=0, is_psu_fan=False, psu_index=0):
-        self._api_helper=APIHelper()
+        self._api_helper=_API_HELPER
+        # Integer nodes are opened once and re-read with pread
+        self._fds = {}
         self.fan_index = fan_index
         self.fan_tray_index = fan_tray_index
         self.is_psu_fan = is_psu_fan
 
         if self.is_psu_fan:
             self.psu_index = psu_index
-            self.psu_i2c_num = PSU_I2C_MAPPING[self.psu_index]['num']
-            self.psu_i2c_addr = PSU_I2C_MAPPING[self.psu_index]['addr']
+            self.psu_i2c_num, self.psu_i2c_addr = PSU_I2C_MAPPING[self.psu_index]
             self.psu_hwmon_path = PSU_HWMON_I2C_PATH.format(
                 self.psu_i2c_num, self.psu_i2c_addr)
 
+        # sysfs paths never change for a given fan, build them once
+        if self.is_psu_fan:
+            self._dir_path = "{}{}".format(self.psu_hwmon_path, 'psu_fan_dir')
+            self._speed_path = "{}{}".format(self.psu_hwmon_path, 'psu_fan1_speed_rpm')
+        else:
+            self._dir_path = "{}{}{}".format(CPLD_I2C_PATH, 'direction_', self.fan_tray_index)
+            self._speed_path = "{}{}".format(CPLD_I2C_PATH, 'duty_cycle_percentage')
+        self._present_path = "{}{}{}".format(CPLD_I2C_PATH, 'present_', self.fan_index+1)
+        self._presence = None
+        self._presence_time = 0
+
         FanBase.__init__(self)  
 
+    def __del__(self):
+        for fd in self._fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fds.clear()
+
+    def __read_raw(self, path):
+        fd = self._fds.get(path)
+        if fd is None:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                return None
+            self._fds[path] = fd
+
+        try:
+            return os.pread(fd, 16, 0).strip()
+        except OSError:
+            # Node went away, reopen on the next read
+            del self._fds[path]
+            os.close(fd)
+            return None
+
+    def __read_int(self, path):
+        buf = self.__read_raw(path)
+        if not buf:
+            return None
+        try:
+            return int(buf)
+        except ValueError:
+            return None
+
 
     def get_direction(self):
         """
@@ -57,10 +111,9 @@ class Fan(FanBase):
 
 
         if not self.is_psu_fan:
-            dir_str = "{}{}{}".format(CPLD_I2C_PATH, 'direction_', self.fan_tray_index)
-            val=self._api_helper.read_txt_file(dir_str)
-            if val is not None:
-                if val==0:#F2B
+            val=self.__read_raw(self._dir_path)
+            if val:
+                if val[:1]==b'0':#F2B
                     direction=self.FAN_DIRECTION_EXHAUST
                 else:
                     direction=self.FAN_DIRECTION_INTAKE
@@ -68,8 +121,7 @@ class Fan(FanBase):
                 direction=self.FAN_DIRECTION_EXHAUST
 
         else: #For PSU
-            dir_str = "{}{}".format(self.psu_hwmon_path,'psu_fan_dir')
-            val=self._api_helper.read_txt_file(dir_str)
+            val=self._api_helper.read_txt_file(self._dir_path)
             if val is not None:
                 if val=='F2B':
                     direction=self.FAN_DIRECTION_EXHAUST
@@ -90,20 +142,18 @@ class Fan(FanBase):
         """
         speed = 0
         if self.is_psu_fan:
-            psu_fan_path= "{}{}".format(self.psu_hwmon_path, 'psu_fan1_speed_rpm')
-            fan_speed_rpm = self._api_helper.read_txt_file(psu_fan_path)
+            fan_speed_rpm = self.__read_int(self._speed_path)
             if fan_speed_rpm is not None:
-                speed = (int(fan_speed_rpm,10))*100/26688
+                speed = fan_speed_rpm * 100 // PSU_FAN_MAX_RPM
                 if speed > 100:
                     speed=100
             else:
                 return 0
         elif self.get_presence():            
-            speed_path = "{}{}".format(CPLD_I2C_PATH, 'duty_cycle_percentage')
-            speed=self._api_helper.read_txt_file(speed_path)
+            speed=self.__read_int(self._speed_path)
             if speed is None:
                 return 0
-        return int(speed)
+        return speed
 
     def get_target_speed(self):
         """
@@ -138,8 +188,7 @@ class Fan(FanBase):
         """
 
         if not self.is_psu_fan and self.get_presence():            
-            speed_path = "{}{}".format(CPLD_I2C_PATH, 'duty_cycle_percentage')
-            return self._api_helper.write_txt_file(speed_path, int(speed))
+            return self._api_helper.write_txt_file(self._speed_path, int(speed))
 
         return False
 
@@ -160,12 +209,14 @@ class Fan(FanBase):
         Returns:
             bool: True if FAN is present, False if not
         """
-        present_path = "{}{}{}".format(CPLD_I2C_PATH, 'present_', self.fan_index+1)
-        val=self._api_helper.read_txt_file(present_path)
-        if not self.is_psu_fan:
-            if val is not None:
-                return int(val, 10)==1
-            else:
-                return False
-        else:
+        if self.is_psu_fan:
             return True
+
+        now = time.monotonic()
+        if self._presence is None or \
+           now - self._presence_time >= PRESENCE_CACHE_TTL:
+            val=self.__read_raw(self._present_path)
+            self._presence = val is not None and val[:1]==b'1'
+            self._presence_time = now
+
+        return self._presence
@@ -7,71 +7,154 @@
 #############################################################################
 
 import os
-import os.path
 import glob
+import time
 
 try:
     from sonic_platform_base.thermal_base import ThermalBase
 except ImportError as e:
     raise ImportError(str(e) + "- required module not found")
 
+# get_temperature/get_presence/get_status are polled back to back,
+# serve them from one sysfs read within this window (seconds)
+TEMP_INPUT_CACHE_TTL = 0.5
+# tempN_max only changes through set_high_threshold, re-read it rarely
+HIGH_THRESHOLD_CACHE_TTL = 5
+
 
 class Thermal(ThermalBase):
     """Platform-specific Thermal class"""
 
-    THERMAL_NAME_LIST = []
+    __slots__ = ('index', 'hwmon_path', 'ss_index', '_name', '_temp_file',
+                 '_max_file', '_hwmon_dir', '_temp_fd', '_temp_cache',
+                 '_temp_cache_time', '_high_threshold',
+                 '_high_threshold_time')
+
+    THERMAL_NAME_LIST = (
+        "Temp sensor 1",
+        "Temp sensor 2",
+        "Temp sensor 3",
+        "Temp sensor 4",
+        "Temp sensor 5",
+        "Temp sensor 6"
+    )
+    # hwmon path of each sensor, indexed like THERMAL_NAME_LIST
+    THERMAL_I2C_PATH_LIST = (
+        "15-0048/hwmon/hwmon*/",
+        "15-0049/hwmon/hwmon*/",
+        "15-004a/hwmon/hwmon*/",
+        "15-004b/hwmon/hwmon*/",
+        "15-004c/hwmon/hwmon*/",
+        "15-004f/hwmon/hwmon*/"
+    )
     SYSFS_PATH = "/sys/bus/i2c/devices"
 
     def __init__(self, thermal_index=0):
-        self.THERMAL_NAME_LIST = []
-        self.SYSFS_PATH = "/sys/bus/i2c/devices"
         self.index = thermal_index
-        # Add thermal name
-        self.THERMAL_NAME_LIST.append("Temp sensor 1")
-        self.THERMAL_NAME_LIST.append("Temp sensor 2")
-        self.THERMAL_NAME_LIST.append("Temp sensor 3")        
-        self.THERMAL_NAME_LIST.append("Temp sensor 4")       
-        self.THERMAL_NAME_LIST.append("Temp sensor 5")        
-        self.THERMAL_NAME_LIST.append("Temp sensor 6")        
+        # Opened on first read and kept open, sysfs re-reads from offset 0
+        self._temp_fd = None
+        self._temp_cache = None
+        self._temp_cache_time = 0
+        self._high_threshold = None
+        self._high_threshold_time = 0
 
         # Set hwmon path
-        i2c_path = {
-            0: "15-0048/hwmon/hwmon*/", 
-            1: "15-0049/hwmon/hwmon*/", 
-            2: "15-004a/hwmon/hwmon*/", 
-            3: "15-004b/hwmon/hwmon*/", 
-            4: "15-004c/hwmon/hwmon*/", 
-            5: "15-004f/hwmon/hwmon*/"
-        }.get(self.index, None)
-
-        self.hwmon_path = "{}/{}".format(self.SYSFS_PATH, i2c_path)
-        self.ss_key = self.THERMAL_NAME_LIST[self.index]
+        self.hwmon_path = "{}/{}".format(
+            self.SYSFS_PATH, self.THERMAL_I2C_PATH_LIST[self.index])
         self.ss_index = 1
 
-    def __read_txt_file(self, file_path):
-        for filename in glob.glob(file_path):
+        # Name and sysfs nodes never change once the index is known
+        self._name = self.THERMAL_NAME_LIST[self.index]
+        self._temp_file = "temp{}_input".format(self.ss_index)
+        self._max_file = "temp{}_max".format(self.ss_index)
+
+        # hwmonN is numbered at probe time, the glob is resolved once on
+        # first sysfs access rather than for every sensor at chassis init
+        self._hwmon_dir = None
+
+    def __del__(self):
+        self.__close_temp_fd()
+
+    def __get_hwmon_dir(self):
+        # hwmon_path ends with '/', so the resolved dir does too
+        if self._hwmon_dir is None:
+            for path in glob.glob(self.hwmon_path):
+                self._hwmon_dir = path
+                break
+
+        return self._hwmon_dir
+
+    def __read_txt_file(self, file_name):
+        hwmon_dir = self.__get_hwmon_dir()
+        if hwmon_dir is None:
+            return None
+
+        try:
+            with open(hwmon_dir + file_name, 'r') as fd:
+                data =fd.readline().rstrip()
+                return data
+        except IOError as e:
+            # Device may have been re-probed as another hwmonN
+            self._hwmon_dir = None
+
+        return None
+
+    def __close_temp_fd(self):
+        if self._temp_fd is not None:
             try:
-                with open(filename, 'r') as fd:                    
-                    data =fd.readline().rstrip()
-                    return data
-            except IOError as e:
+                os.close(self._temp_fd)
+            except OSError:
                 pass
+            self._temp_fd = None
 
-        return None
+    def __pread_temp_input(self):
+        if self._temp_fd is None:
+            hwmon_dir = self.__get_hwmon_dir()
+            if hwmon_dir is None:
+                return None
+            try:
+                self._temp_fd = os.open(hwmon_dir + self._temp_file,
+                                        os.O_RDONLY)
+            except OSError:
+                self._hwmon_dir = None
+                return None
+
+        try:
+            return os.pread(self._temp_fd, 32, 0).decode().strip()
+        except OSError:
+            # Device went away, reopen on the next read
+            self.__close_temp_fd()
+            return None
+
+    def __read_temp_input(self):
+        # Shared by get_temperature, get_presence and get_status
+        now = time.monotonic()
+        if self._temp_cache is not None and \
+           now - self._temp_cache_time < TEMP_INPUT_CACHE_TTL:
+            return self._temp_cache
+
+        raw_temp = self.__pread_temp_input()
+        if raw_temp is not None:
+            self._temp_cache = raw_temp
+            self._temp_cache_time = now
+
+        return raw_temp
 
-    def __get_temp(self, temp_file):
-        temp_file_path = os.path.join(self.hwmon_path, temp_file)
-        raw_temp = self.__read_txt_file(temp_file_path)
+    def __raw_to_temp(self, raw_temp):
         if raw_temp is not None:
-            return float(raw_temp)/1000
+            # hwmon reports integer millidegrees
+            try:
+                return int(raw_temp) / 1000.0
+            except ValueError:
+                return float(raw_temp)/1000
         else:
-            return 0        
+            return 0
 
     def __set_threshold(self, file_name, temperature):
-        temp_file_path = os.path.join(self.hwmon_path, file_name)
-        for filename in glob.glob(temp_file_path):
+        hwmon_dir = self.__get_hwmon_dir()
+        if hwmon_dir is not None:
             try:
-                with open(filename, 'w') as fd:
+                with open(hwmon_dir + file_name, 'w') as fd:
                     fd.write(str(temperature))
                 return True
             except IOError as e:
@@ -85,8 +168,7 @@ class Thermal(ThermalBase):
             A float number of current temperature in Celsius up to nearest thousandth
             of one degree Celsius, e.g. 30.125
         """
-        temp_file = "temp{}_input".format(self.ss_index)
-        return self.__get_temp(temp_file)
+        return self.__raw_to_temp(self.__read_temp_input())
 
     def get_high_threshold(self):
         """
@@ -95,8 +177,16 @@ class Thermal(ThermalBase):
             A float number, the high threshold temperature of thermal in Celsius
             up to nearest thousandth of one degree Celsius, e.g. 30.125
         """
-        temp_file = "temp{}_max".format(self.ss_index)
-        return self.__get_temp(temp_file)
+        now = time.monotonic()
+        if self._high_threshold is None or \
+           now - self._high_threshold_time >= HIGH_THRESHOLD_CACHE_TTL:
+            raw_temp = self.__read_txt_file(self._max_file)
+            if raw_temp is None:
+                return 0
+            self._high_threshold = self.__raw_to_temp(raw_temp)
+            self._high_threshold_time = now
+
+        return self._high_threshold
 
     def set_high_threshold(self, temperature):
         """
@@ -107,9 +197,10 @@ class Thermal(ThermalBase):
         Returns:
             A boolean, True if threshold is set successfully, False if not
         """
-        temp_file = "temp{}_max".format(self.ss_index)
-        temperature = temperature *1000
-        self.__set_threshold(temp_file, temperature)
+        # hwmon takes integer millidegrees, "84000.0" is rejected
+        temperature = int(round(temperature * 1000))
+        self.__set_threshold(self._max_file, temperature)
+        self._high_threshold = None
 
         return True
 
@@ -119,7 +210,7 @@ class Thermal(ThermalBase):
             Returns:
             string: The name of the thermal device
         """
-        return self.THERMAL_NAME_LIST[self.index]
+        return self._name
 
     def get_presence(self):
         """
@@ -127,13 +218,7 @@ class Thermal(ThermalBase):
         Returns:
             bool: True if Thermal is present, False if not
         """
-        temp_file = "temp{}_input".format(self.ss_index)
-        temp_file_path = os.path.join(self.hwmon_path, temp_file)
-        raw_txt = self.__read_txt_file(temp_file_path)
-        if raw_txt is not None:
-            return True
-        else:
-            return False
+        return self.__read_temp_input() is not None
 
     def get_status(self):
         """
@@ -141,11 +226,5 @@ class Thermal(ThermalBase):
         Returns:
             A boolean value, True if device is operating properly, False if not
         """
-
-        file_str = "temp{}_input".format(self.ss_index)
-        file_path = os.path.join(self.hwmon_path, file_str)
-        raw_txt = self.__read_txt_file(file_path)
-        if raw_txt is None:
-            return False
-        else:     
-            return int(raw_txt) != 0
+        raw_txt = self.__read_temp_input()
+        return raw_txt is not None and int(raw_txt) != 0
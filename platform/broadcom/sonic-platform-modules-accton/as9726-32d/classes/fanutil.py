@@ -20,6 +20,7 @@
 # ------------------------------------------------------------------
 
 try:
+    import os
     import logging
 except ImportError as e:
     raise ImportError('%s - required module not found' % str(e))
@@ -28,6 +29,8 @@ except ImportError as e:
 class FanUtil(object):
     """Platform-specific FanUtil class"""
 
+    __slots__ = ('_fds',)
+
     FAN_NUM_ON_MAIN_BROAD = 6
     FAN_NUM_1_IDX = 1
     FAN_NUM_2_IDX = 2
@@ -49,7 +52,8 @@ class FanUtil(object):
     """ Dictionary where
         key1 = fan id index (integer) starting from 1
         key2 = fan node index (interger) starting from 1
-        value = path to fan device file (string) """
+        value = path to fan device file (string)
+        Built once at module load, see the end of this file """
     _fan_device_path_mapping = {}
     
 #fan1_direction
@@ -80,6 +84,40 @@ class FanUtil(object):
     def _get_fan_device_node(self, fan_num, node_num):
         return self._fan_device_node_mapping[(fan_num, node_num)]
 
+    def _get_node_fd(self, device_path, flags):
+        """ sysfs nodes are opened once and re-read/written from offset 0 """
+        fd = self._fds.get((device_path, flags))
+        if fd is None:
+            fd = os.open(device_path, flags)
+            self._fds[(device_path, flags)] = fd
+        return fd
+
+    def _close_node_fd(self, device_path, flags):
+        fd = self._fds.pop((device_path, flags), None)
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _read_node(self, device_path):
+        fd = self._get_node_fd(device_path, os.O_RDONLY)
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            return os.read(fd, 32)
+        except OSError:
+            self._close_node_fd(device_path, os.O_RDONLY)
+            raise
+
+    def _write_node(self, device_path, content):
+        fd = self._get_node_fd(device_path, os.O_RDWR)
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, content.encode())
+        except OSError:
+            self._close_node_fd(device_path, os.O_RDWR)
+            raise
+
     def _get_fan_node_val(self, fan_num, node_num):
         if fan_num < self.FAN_NUM_1_IDX or fan_num > self.FAN_NUM_ON_MAIN_BROAD:
             logging.debug('GET. Parameter error. fan_num:%d', fan_num)
@@ -92,24 +130,14 @@ class FanUtil(object):
         device_path = self.get_fan_device_path(fan_num, node_num)
        
         try:
-            val_file = open(device_path, 'r')
-        except IOError as e:
-            logging.error('GET. unable to open file: %s', str(e))
-            return None
-
-        content = val_file.readline().rstrip()
-        
-        if content == '':
+            # int() skips the trailing newline sysfs appends
+            return int(self._read_node(device_path))
+        except OSError as e:
+            logging.error('GET. unable to read file: %s', str(e))
+        except ValueError:
             logging.debug('GET. content is NULL. device_path:%s', device_path)
-            return None
-
-        try:
-		    val_file.close()
-        except IOError:
-            logging.debug('GET. unable to close file. device_path:%s', device_path)
-            return None
 
-        return int(content)
+        return None
 
     def _set_fan_node_val(self, fan_num, node_num, val):
         if fan_num < self.FAN_NUM_1_IDX or fan_num > self.FAN_NUM_ON_MAIN_BROAD:
@@ -120,36 +148,27 @@ class FanUtil(object):
             logging.debug('GET. Parameter error. node_num:%d', node_num)
             return None
 
+        device_path = self.get_fan_device_path(fan_num, node_num)
         content = str(val)
         if content == '':
             logging.debug('GET. content is NULL. device_path:%s', device_path)
             return None
 
-        device_path = self.get_fan_device_path(fan_num, node_num)
-        try:
-            val_file = open(device_path, 'w')
-        except IOError as e:
-            logging.error('GET. unable to open file: %s', str(e))
-            return None
-
-        val_file.write(content)
-
         try:
-		    val_file.close()
-        except BaseException:
-            logging.debug('GET. unable to close file. device_path:%s', device_path)
+            self._write_node(device_path, content)
+        except OSError as e:
+            logging.error('GET. unable to write file: %s', str(e))
             return None
 
         return True
 
     def __init__(self):
-        fan_path = self.BASE_VAL_PATH 
+        self._fds = {}
+
+    def __del__(self):
+        for (device_path, flags) in list(self._fds):
+            self._close_node_fd(device_path, flags)
 
-        for fan_num in range(self.FAN_NUM_1_IDX, self.FAN_NUM_ON_MAIN_BROAD+1):
-            for node_num in range(self.FAN_NODE_FAULT_IDX_OF_MAP, self.FAN_NODE_NUM_OF_MAP+1):
-                self._fan_device_path_mapping[(fan_num, node_num)] = fan_path.format(
-                   self._fan_device_node_mapping[(fan_num, node_num)])
-               
     def get_num_fans(self):
         return self.FAN_NUM_ON_MAIN_BROAD
 
@@ -169,7 +188,7 @@ class FanUtil(object):
         return len(self._fan_device_path_mapping)
 
     def get_fan_device_path(self, fan_num, node_num):
-        return self._fan_device_path_mapping[(fan_num, node_num)]
+        return self._fan_device_paths[fan_num-1][node_num-1]
 
     def get_fan_fault(self, fan_num):
         return self._get_fan_node_val(fan_num, self.FAN_NODE_FAULT_IDX_OF_MAP)
@@ -178,27 +197,22 @@ class FanUtil(object):
         return self._get_fan_node_val(fan_num, self.FAN_NODE_DIR_IDX_OF_MAP)
 
     def get_fan_duty_cycle(self):
-        #duty_path = self.FAN_DUTY_PATH
         try:
-            val_file = open(self.FAN_DUTY_PATH)
-        except IOError as e:
+            return int(self._read_node(self.FAN_DUTY_PATH))
+        except OSError as e:
             print "Error: unable to open file: %s" % str(e)          
-            return False
+        except ValueError:
+            logging.debug('GET. content is NULL. device_path:%s', self.FAN_DUTY_PATH)
 
-        content = val_file.readline().rstrip()
-        val_file.close()
-        
-        return int(content)
+        return False
        
     def set_fan_duty_cycle(self, val):
         try:
-            fan_file = open(self.FAN_DUTY_PATH, 'r+')
-        except IOError as e:
+            self._write_node(self.FAN_DUTY_PATH, str(val))
+        except OSError as e:
             print "Error: unable to open file: %s" % str(e)          
             return False
-        
-        fan_file.write(str(val))
-        fan_file.close()
+
         return True
   
     def get_fanr_speed(self, fan_num):
@@ -209,8 +223,23 @@ class FanUtil(object):
             logging.debug('GET. Parameter error. fan_num, %d', fan_num)
             return None
 
-        if self.get_fan_fault(fan_num) is not None and self.get_fan_fault(fan_num) > 0:
+        fault = self.get_fan_fault(fan_num)
+        if fault is not None and fault > 0:
             logging.debug('GET. FAN fault. fan_num, %d', fan_num)
             return False
 
         return True
+
+
+# The node paths are the same for every FanUtil instance
+FanUtil._fan_device_path_mapping = dict(
+    (key, FanUtil.BASE_VAL_PATH.format(node))
+    for key, node in FanUtil._fan_device_node_mapping.items())
+
+# Same paths as a [fan-1][node-1] table for the per-poll lookups
+FanUtil._fan_device_paths = tuple(
+    tuple(FanUtil._fan_device_path_mapping[(fan_num, node_num)]
+          for node_num in range(FanUtil.FAN_NODE_FAULT_IDX_OF_MAP,
+                                FanUtil.FAN_NODE_NUM_OF_MAP+1))
+    for fan_num in range(FanUtil.FAN_NUM_1_IDX,
+                         FanUtil.FAN_NUM_ON_MAIN_BROAD+1))